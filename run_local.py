@@ -1,5 +1,5 @@
 import argparse
-import json
+import orjson
 from web_crawler import WebCrawler, generate_html_report
 import datetime
 import os
@@ -11,6 +11,8 @@ def main():
     parser.add_argument('--exclude', nargs='*', default=[], help='URL patterns to exclude (space separated)')
     parser.add_argument('--max_pages', type=int, default=100, help='Maximum number of pages to crawl')
     parser.add_argument('--concurrency', type=int, default=10, help='Number of concurrent requests')
+    parser.add_argument('--host_concurrency', type=int, default=None, help='Maximum concurrent requests to the crawled host (default: same as --concurrency)')
+    parser.add_argument('--http2', action='store_true', help='Multiplex requests over HTTP/2 (requires httpx[http2])')
     parser.add_argument('--output_dir', default='reports', help='Directory to store reports')
     
     args = parser.parse_args()
@@ -20,35 +22,35 @@ def main():
     print(f"Max pages: {args.max_pages}")
     print(f"Concurrency: {args.concurrency}")
     
-    # Run the crawler
-    crawler = WebCrawler(
-        start_url=args.start_url,
-        exclude_patterns=args.exclude,
-        max_pages=args.max_pages,
-        concurrency=args.concurrency
-    )
-    
-    broken_links = crawler.crawl()
-    
     # Create output directory if it doesn't exist
     os.makedirs(args.output_dir, exist_ok=True)
     
-    # Generate report
-    scan_date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    html_report = generate_html_report(broken_links, args.start_url, scan_date)
-    
-    # Save reports
     date_prefix = datetime.datetime.now().strftime("%Y-%m-%d")
     html_file = os.path.join(args.output_dir, f"{date_prefix}_broken_links_report.html")
-    json_file = os.path.join(args.output_dir, f"{date_prefix}_broken_links_data.json")
+    json_file = os.path.join(args.output_dir, f"{date_prefix}_broken_links_data.ndjson")
+    
+    # Run the crawler, writing each broken link to disk as one NDJSON line
+    with open(json_file, 'wb') as f:
+        crawler = WebCrawler(
+            start_url=args.start_url,
+            exclude_patterns=args.exclude,
+            max_pages=args.max_pages,
+            concurrency=args.concurrency,
+            host_concurrency=args.host_concurrency,
+            http2=args.http2,
+            on_broken=lambda record: f.write(orjson.dumps(record) + b'\n')
+        )
+        crawler.crawl()
+    
+    # Generate report in one pass over the streamed records
+    scan_date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with open(json_file, 'rb') as f:
+        html_report = generate_html_report((orjson.loads(line) for line in f), args.start_url, scan_date)
     
     with open(html_file, 'w', encoding='utf-8') as f:
         f.write(html_report)
     
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(broken_links, f, indent=2)
-    
-    print(f"Crawl completed. Found {len(broken_links)} broken links.")
+    print(f"Crawl completed. Found {crawler.broken_count} broken links.")
     print(f"HTML report saved to: {html_file}")
     print(f"JSON data saved to: {json_file}")
 
@@ -1,19 +1,175 @@
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+import aiohttp
+import asyncio
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from bs4 import BeautifulSoup, SoupStrainer
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
 import boto3
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
 import datetime
+import hashlib
+from html import escape
 import json
+import orjson
 import os
-from concurrent.futures import ThreadPoolExecutor
 import logging
+import re
+import threading
+from yarl import URL
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+USER_AGENT = 'WebCrawler/1.0'
+
+# Network failures that mark a URL as broken with no status code
+REQUEST_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+if httpx is not None:
+    REQUEST_ERRORS += (httpx.HTTPError,)
+
+# Only build tree nodes for links; every other element is skipped by the parser
+_ONLY_A = SoupStrainer('a', href=True)
+
+# Pages larger than this are checked but not downloaded for link extraction
+MAX_HTML_BYTES = 5 * 1024 * 1024
+
+# Common non-HTML resources that are never crawled
+EXCLUDED_EXTENSIONS = frozenset(('.jpg', '.jpeg', '.png', '.gif', '.pdf', '.zip', '.doc', '.docx'))
+
+# HTML report templates, filled in by generate_html_report
+REPORT_HEADER = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Broken Links Report</title>
+        <style>
+            body {{ font-family: Arial, sans-serif; margin: 20px; }}
+            h1, h2 {{ color: #333; }}
+            .summary {{ background-color: #f5f5f5; padding: 15px; border-radius: 5px; margin-bottom: 20px; }}
+            table {{ border-collapse: collapse; width: 100%; }}
+            th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
+            th {{ background-color: #f2f2f2; }}
+            tr:nth-child(even) {{ background-color: #f9f9f9; }}
+            .status-error {{ color: #d9534f; }}
+            .status-warning {{ color: #f0ad4e; }}
+        </style>
+    </head>
+    <body>
+        <h1>Web Crawler: Broken Links Report</h1>
+        <div class="summary">
+            <p><strong>Start URL:</strong> {start_url}</p>
+            <p><strong>Scan Date:</strong> {scan_date}</p>
+            <p><strong>Total Broken Links Found:</strong> {count}</p>
+        </div>
+        
+        <h2>Broken Links</h2>
+        
+        <table>
+            <tr>
+                <th>URL</th>
+                <th>Status</th>
+                <th>Referred From</th>
+            </tr>
+    """
+
+REPORT_ROW = """
+            <tr>
+                <td>{url}</td>
+                <td class="{status_class}">{status}</td>
+                <td>{referring}</td>
+            </tr>
+        """
+
+REPORT_FOOTER = """
+        </table>
+    </body>
+    </html>
+    """
+
+def content_signature(content):
+    """Return a 64-bit fingerprint of a page body for spotting mirrored pages"""
+    if xxhash is not None:
+        return xxhash.xxh64_intdigest(content)
+    return int.from_bytes(hashlib.blake2b(content, digest_size=8).digest(), 'big')
+
+async def read_limited(response, limit):
+    """Read a response body, stopping once it grows past limit bytes"""
+    chunks = []
+    size = 0
+    async for chunk in response.content.iter_chunked(64 * 1024):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > limit:
+            break
+    return b"".join(chunks)
+
+class _HTTP2Response:
+    """The parts of aiohttp.ClientResponse the crawler uses, backed by a streamed httpx response"""
+    def __init__(self, response):
+        self._response = response
+        self.status = response.status_code
+        self.headers = response.headers
+        self.url = URL(str(response.url))
+        self.charset = response.charset_encoding
+        length = response.headers.get('Content-Length', '')
+        self.content_length = int(length) if length.isdigit() else None
+    
+    @property
+    def content(self):
+        """The body stream; like aiohttp's StreamReader it supports iter_chunked()"""
+        return self
+    
+    def iter_chunked(self, size):
+        return self._response.aiter_bytes(size)
+    
+    async def read(self):
+        return await self._response.aread()
+    
+    async def text(self, errors='strict'):
+        return (await self.read()).decode(self.charset or 'utf-8', errors)
+
+class _HTTP2Session:
+    """An aiohttp.ClientSession stand-in that multiplexes requests over HTTP/2 with httpx"""
+    def __init__(self, concurrency, headers, timeout):
+        self._client = httpx.AsyncClient(
+            http2=True,
+            headers=headers,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        )
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+    
+    @asynccontextmanager
+    async def get(self, url, allow_redirects=True):
+        async with self._client.stream('GET', str(url), follow_redirects=allow_redirects) as response:
+            yield _HTTP2Response(response)
+
 class WebCrawler:
-    def __init__(self, start_url, exclude_patterns=None, max_pages=100, concurrency=10):
+    def __init__(self, start_url, exclude_patterns=None, max_pages=100, concurrency=10, host_concurrency=None,
+                 on_broken=None, http2=False):
         """
         Initialize the web crawler
         
@@ -22,187 +178,371 @@ class WebCrawler:
             exclude_patterns (list): List of URL patterns to exclude from crawling
             max_pages (int): Maximum number of pages to crawl
             concurrency (int): Number of concurrent requests
+            host_concurrency (int): Maximum number of in-flight requests to the crawled host;
+                defaults to concurrency, since every request goes to that one host
+            on_broken (callable): Called with each broken link record once the crawl has finished
+                (so referred_from lists every referrer found, up to 5); when given, records are
+                handed off instead of kept in broken_links
+            http2 (bool): Multiplex requests over HTTP/2 with httpx instead of using aiohttp
         """
+        if http2 and httpx is None:
+            raise ImportError("http2=True requires httpx with HTTP/2 support (pip install 'httpx[http2]')")
+        
         self.start_url = start_url
-        self.domain = urlparse(start_url).netloc
+        self._start_key = self.canonicalize(start_url)
+        self.domain = urlsplit(self._start_key).netloc
+        self._host_roots = (f'http://{self.domain}', f'https://{self.domain}')
+        self._host_prefixes = tuple(f'{root}/' for root in self._host_roots)
         self.visited_urls = set()
-        self.urls_to_visit = [start_url]
+        self.urls_to_visit = None  # asyncio.Queue of (canonical, url as linked), created on the crawl's event loop
+        self._seen = {self._start_key}  # Canonical form of every URL ever queued, visited or not
         self.broken_links = []
+        self.broken_count = 0
+        self._broken = []  # (canonical, url, status_code) of broken links, reported after the crawl
+        self.on_broken = on_broken
+        self.referrers = defaultdict(list)  # Canonical URL -> up to 5 pages linking to it
+        self._content_signatures = set()  # (page path, body fingerprint) pairs already parsed
         self.exclude_patterns = exclude_patterns or []
+        self._exclude_re = (
+            re.compile('|'.join(map(re.escape, self.exclude_patterns)))
+            if self.exclude_patterns else None
+        )
         self.max_pages = max_pages
         self.concurrency = concurrency
+        self.host_concurrency = host_concurrency or concurrency
+        self.http2 = http2
+        self._robots = None
+        self._crawl_delay = None
+        self._host_semaphore = None
     
-    def should_exclude(self, url):
-        """Check if URL should be excluded based on patterns"""
-        parsed_url = urlparse(url)
+    @staticmethod
+    def canonicalize(url):
+        """Return a canonical form of a URL (str or yarl.URL) so equivalent URLs compare equal
+        
+        Only used as a deduplication key; URLs are fetched and reported as linked.
+        """
+        # yarl already lowercases scheme and host, drops default ports
+        # and normalizes percent-encoding while parsing
+        url = URL(url)
+        query = sorted(url.query.items())
+        
+        # Drop trailing slashes on non-root paths
+        if url.absolute:
+            url = url.with_path(url.raw_path.rstrip('/') or '/', encoded=True)
         
-        # Skip external domains
-        if parsed_url.netloc and parsed_url.netloc != self.domain:
+        # Sort query parameters and drop the fragment
+        return str(url.with_query(query).with_fragment(None))
+    
+    def robots_allows(self, url):
+        """Check if robots.txt (once loaded) lets the crawler fetch a URL"""
+        return self._robots is None or self._robots.can_fetch(USER_AGENT, url)
+    
+    def should_exclude(self, url):
+        """Check if a resolved absolute URL should be excluded based on patterns"""
+        # Skip external domains and non-HTTP schemes (mailto:, javascript:, ...)
+        if not url.startswith(self._host_prefixes) and url not in self._host_roots:
             return True
             
         # Skip URLs matching exclude patterns
-        for pattern in self.exclude_patterns:
-            if pattern in url:
-                return True
+        if self._exclude_re is not None and self._exclude_re.search(url):
+            return True
+        
+        # Skip URLs disallowed by robots.txt
+        if not self.robots_allows(url):
+            return True
                 
         # Skip common non-HTML resources
-        path = parsed_url.path.lower()
-        if path.endswith(('.jpg', '.jpeg', '.png', '.gif', '.pdf', '.zip', '.doc', '.docx')):
+        path = url.partition('?')[0]
+        if path[path.rfind('.'):].lower() in EXCLUDED_EXTENSIONS:
             return True
             
         return False
     
-    def check_url(self, url):
-        """Check if a URL is valid and get all links from it"""
-        try:
-            headers = {'User-Agent': 'WebCrawler/1.0'}
-            response = requests.get(url, timeout=10, headers=headers)
-            status_code = response.status_code
+    def extract_links(self, key, base_url, content, encoding=None):
+        """
+        Extract the crawlable links from an HTML page as (canonical, resolved URL) pairs
+        
+        Args:
+            key (str): Canonical URL of the page, used to skip self-links
+            base_url (yarl.URL): URL the page was served from, used to resolve relative links
+            content (bytes): Raw HTML body
+            encoding (str): Charset from the response headers, if any
+        """
+        # Hand lxml the raw bytes; the HTTP charset (if any) saves it from sniffing
+        soup = BeautifulSoup(content, 'lxml', from_encoding=encoding, parse_only=_ONLY_A)
+        links = []
+        seen_hrefs = set()
+        page_links = set()  # Canonical URLs already considered on this page
+        
+        for link in soup.find_all('a'):
+            href = link['href']
             
-            # Handle redirects
-            if 300 <= status_code < 400:
-                redirect_url = response.headers.get('Location')
-                if redirect_url:
-                    absolute_redirect = urljoin(url, redirect_url)
-                    logger.info(f"Redirect: {url} -> {absolute_redirect}")
-                    return status_code, []
+            # Empty and fragment-only hrefs always point back at this page
+            if not href or href[0] == '#':
+                continue
             
-            # Handle 404s and other errors
-            if status_code >= 400:
-                logger.warning(f"Broken link found: {url} (Status: {status_code})")
-                return status_code, []
+            # Menus and nav bars repeat the same hrefs many times per page
+            if href in seen_hrefs:
+                continue
+            seen_hrefs.add(href)
             
-            # Only parse HTML content
-            content_type = response.headers.get('Content-Type', '')
-            if 'text/html' not in content_type.lower():
-                return status_code, []
+            try:
+                absolute_url = base_url.join(URL(href)).with_fragment(None)
+                link_key = self.canonicalize(absolute_url)
+            except ValueError:
+                # Malformed href (e.g. a bad port or IPv6 literal)
+                continue
             
-            # Extract links from HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-            links = []
+            # Skip other spellings of this page and repeated targets
+            if link_key == key or link_key in page_links:
+                continue
+            page_links.add(link_key)
             
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                absolute_url = urljoin(url, href)
-                
-                # Skip fragment identifiers within the same page
-                if absolute_url.split('#')[0] == url:
-                    continue
-                    
-                # Normalize the URL
-                parsed = urlparse(absolute_url)
-                normalized_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-                if parsed.query:
-                    normalized_url += f"?{parsed.query}"
+            resolved_url = str(absolute_url)
+            if not self.should_exclude(resolved_url):
+                links.append((link_key, resolved_url))
+        
+        return links
+    
+    async def load_robots(self, session):
+        """Fetch and parse robots.txt for the crawled host"""
+        robots_url = str(URL(self.start_url).with_path('/robots.txt'))
+        robots = RobotFileParser(robots_url)
+        try:
+            async with session.get(robots_url) as response:
+                if response.status in (401, 403):
+                    robots.disallow_all = True
+                elif response.status < 400:
+                    robots.parse((await response.text(errors='replace')).splitlines())
+                else:
+                    return
+        except REQUEST_ERRORS as e:
+            logger.warning(f"Could not fetch {robots_url}: {str(e)}")
+            return
+        
+        self._robots = robots
+        self._crawl_delay = robots.crawl_delay(USER_AGENT)
+        if self._crawl_delay:
+            logger.info(f"Honoring Crawl-delay of {self._crawl_delay}s from {robots_url}")
+    
+    async def check_url(self, session, url):
+        """Check if a URL is valid and get all links from it, respecting host limits"""
+        async with self._host_semaphore:
+            result = await self._check_url(session, url)
+            if self._crawl_delay:
+                await asyncio.sleep(self._crawl_delay)
+        return result
+    
+    async def _check_url(self, session, url):
+        """Fetch a URL and extract the links from it"""
+        key = self.canonicalize(url)
+        try:
+            async with session.get(url, allow_redirects=False) as response:
+                if not 300 <= response.status < 400:
+                    return await self._read_page(url, key, response)
                 
-                if not self.should_exclude(normalized_url):
-                    links.append(normalized_url)
+                # Handle redirects by queueing the target instead of following it
+                redirect_url = response.headers.get('Location')
+                if not redirect_url:
+                    return response.status, []
+                try:
+                    absolute_redirect = response.url.join(URL(redirect_url)).with_fragment(None)
+                    redirect_key = self.canonicalize(absolute_redirect)
+                except ValueError:
+                    # Malformed Location header (e.g. a bad port or IPv6 literal)
+                    logger.warning(f"Invalid redirect target from {url}: {redirect_url}")
+                    return response.status, []
+                same_page = redirect_key == key
+                if not same_page:
+                    resolved_redirect = str(absolute_redirect)
+                    logger.info(f"Redirect: {url} -> {resolved_redirect}")
+                    if not self.should_exclude(resolved_redirect):
+                        return response.status, [(redirect_key, resolved_redirect)]
+                    if key == self._start_key:
+                        logger.warning(f"Start URL redirects to {resolved_redirect}, which is not crawled; "
+                                       f"use the final URL as start_url to crawl it")
             
-            return status_code, links
+            async with session.get(absolute_redirect) as response:
+                if same_page:
+                    # Same page under another spelling (e.g. an added trailing slash)
+                    return await self._read_page(url, key, response)
+                
+                # Excluded target (off-host, robots.txt or pattern): not crawled, but the
+                # link is still broken when the redirect chain ends in an error
+                if response.status >= 400:
+                    logger.warning(f"Broken link found: {url} -> {response.url} (Status: {response.status})")
+                return response.status, []
             
-        except requests.exceptions.RequestException as e:
+        except REQUEST_ERRORS as e:
             logger.error(f"Error checking {url}: {str(e)}")
             return None, []
     
+    async def _read_page(self, url, key, response):
+        """Return the status code of a non-redirect response and the links on it"""
+        status_code = response.status
+        
+        # Handle 404s and other errors
+        if status_code >= 400:
+            logger.warning(f"Broken link found: {url} (Status: {status_code})")
+            return status_code, []
+        
+        # Only parse HTML content; anything else is closed before its body is read
+        content_type = response.headers.get('Content-Type', '')
+        if 'text/html' not in content_type.lower():
+            return status_code, []
+        if response.content_length and response.content_length > MAX_HTML_BYTES:
+            logger.info(f"Skipping link extraction for large page: {url} ({response.content_length} bytes)")
+            return status_code, []
+        
+        # Content-Length can be missing (chunked) or wrong, so cap the read itself
+        content = await read_limited(response, MAX_HTML_BYTES)
+        if len(content) > MAX_HTML_BYTES:
+            logger.info(f"Skipping link extraction for large page: {url} (over {MAX_HTML_BYTES} bytes)")
+            return status_code, []
+        
+        # The same HTML at the same path (differing only in query string, e.g. tracking
+        # or session parameters) resolves to the same links; don't parse it twice.
+        # Relative hrefs depend on the path, so identical bytes elsewhere still get parsed.
+        signature = (str(response.url.with_query(None).with_fragment(None)), content_signature(content))
+        if signature in self._content_signatures:
+            logger.info(f"Skipping link extraction for duplicate page: {url}")
+            return status_code, []
+        self._content_signatures.add(signature)
+        
+        # Resolve relative links against the URL that was actually served
+        return status_code, self.extract_links(key, response.url, content, response.charset)
+    
     def crawl(self):
         """Crawl the website and find broken links"""
-        while self.urls_to_visit and len(self.visited_urls) < self.max_pages:
-            # Get a batch of URLs to process
-            batch = []
-            while self.urls_to_visit and len(batch) < self.concurrency:
-                url = self.urls_to_visit.pop(0)
-                if url not in self.visited_urls:
-                    batch.append(url)
-                    self.visited_urls.add(url)
-            
-            if not batch:
-                break
+        if uvloop is not None:
+            return uvloop.run(self._crawl())
+        return asyncio.run(self._crawl())
+    
+    async def _worker(self, session):
+        """Check URLs from the queue and queue the new links they contain"""
+        while True:
+            key, url = await self.urls_to_visit.get()
+            try:
+                if len(self.visited_urls) >= self.max_pages:
+                    continue
+                self.visited_urls.add(url)
+                logger.info(f"Crawling {url}. Total visited: {len(self.visited_urls)}")
                 
-            logger.info(f"Crawling batch of {len(batch)} URLs. Total visited: {len(self.visited_urls)}")
-            
-            # Process the batch concurrently
-            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
-                results = list(executor.map(lambda url: (url, self.check_url(url)), batch))
-            
-            # Process results
-            for url, (status_code, links) in results:
+                status_code, links = await self.check_url(session, url)
                 if status_code is None or status_code >= 400:
-                    referring_pages = [page for page in self.visited_urls if page != url]
-                    self.broken_links.append({
-                        'url': url,
-                        'status_code': status_code,
-                        'referred_from': referring_pages[:5]  # Limit to 5 referring pages
-                    })
+                    # Referrers can still be found after this, so the record is built at the end
+                    self._broken.append((key, url, status_code))
+                    self.broken_count += 1
                 
-                # Add new URLs to visit
-                for link in links:
-                    if link not in self.visited_urls and link not in self.urls_to_visit:
-                        self.urls_to_visit.append(link)
+                # Add new URLs to visit, remembering where they were linked from
+                for link_key, link in links:
+                    referring_pages = self.referrers[link_key]
+                    if len(referring_pages) < 5 and url not in referring_pages:
+                        referring_pages.append(url)
+                    if link_key not in self._seen:
+                        self._seen.add(link_key)
+                        self.urls_to_visit.put_nowait((link_key, link))
+            finally:
+                self.urls_to_visit.task_done()
+    
+    def _open_session(self):
+        """Create the HTTP session shared by the whole crawl"""
+        headers = {'User-Agent': USER_AGENT}
+        if self.http2:
+            # Same-host requests share one multiplexed connection when the server speaks HTTP/2
+            return _HTTP2Session(self.concurrency, headers, timeout=10)
+        
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            limit_per_host=self.concurrency,
+            ttl_dns_cache=300
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers=headers,
+            # Per-operation limits like requests' timeout=10, so slow but steady pages still load
+            timeout=aiohttp.ClientTimeout(sock_connect=10, sock_read=10)
+        )
+    
+    async def _crawl(self):
+        """Run the crawl loop on a single shared HTTP session"""
+        async with self._open_session() as session:
+            await self.load_robots(session)
+            
+            # A Crawl-delay means one request at a time, spaced by the delay
+            self._host_semaphore = asyncio.Semaphore(1 if self._crawl_delay else self.host_concurrency)
+            
+            self.urls_to_visit = asyncio.Queue()
+            if self.robots_allows(self.start_url):
+                self.urls_to_visit.put_nowait((self._start_key, self.start_url))
+            else:
+                logger.warning(f"robots.txt disallows the start URL {self.start_url}; nothing to crawl")
+            
+            # Long-lived workers pick up newly found URLs as soon as any request finishes
+            workers = [asyncio.create_task(self._worker(session)) for _ in range(self.concurrency)]
+            queue_drained = asyncio.create_task(self.urls_to_visit.join())
+            try:
+                done, _ = await asyncio.wait([queue_drained, *workers], return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()  # Re-raise an unexpected error from a worker
+            finally:
+                for task in (queue_drained, *workers):
+                    task.cancel()
+                await asyncio.gather(queue_drained, *workers, return_exceptions=True)
         
-        logger.info(f"Crawl completed. Visited {len(self.visited_urls)} URLs, found {len(self.broken_links)} broken links.")
+        for key, url, status_code in self._broken:
+            record = {
+                'url': url,
+                'status_code': status_code,
+                'referred_from': list(self.referrers.get(key, ()))
+            }
+            if self.on_broken is not None:
+                self.on_broken(record)
+            else:
+                self.broken_links.append(record)
+        self._broken = []
+        
+        logger.info(f"Crawl completed. Visited {len(self.visited_urls)} URLs, found {self.broken_count} broken links.")
         return self.broken_links
 
 def generate_html_report(broken_links, start_url, scan_date):
-    """Generate an HTML report of broken links"""
-    html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Broken Links Report</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 20px; }}
-            h1, h2 {{ color: #333; }}
-            .summary {{ background-color: #f5f5f5; padding: 15px; border-radius: 5px; margin-bottom: 20px; }}
-            table {{ border-collapse: collapse; width: 100%; }}
-            th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-            th {{ background-color: #f2f2f2; }}
-            tr:nth-child(even) {{ background-color: #f9f9f9; }}
-            .status-error {{ color: #d9534f; }}
-            .status-warning {{ color: #f0ad4e; }}
-        </style>
-    </head>
-    <body>
-        <h1>Web Crawler: Broken Links Report</h1>
-        <div class="summary">
-            <p><strong>Start URL:</strong> {start_url}</p>
-            <p><strong>Scan Date:</strong> {scan_date}</p>
-            <p><strong>Total Broken Links Found:</strong> {len(broken_links)}</p>
-        </div>
-        
-        <h2>Broken Links</h2>
-        
-        <table>
-            <tr>
-                <th>URL</th>
-                <th>Status</th>
-                <th>Referred From</th>
-            </tr>
-    """
-    
+    """Generate an HTML report from an iterable of broken link records"""
+    parts = [None]  # Header goes first once the total is known
     for link in broken_links:
-        status_class = "status-error" if link['status_code'] >= 400 else "status-warning"
-        referring = "<br>".join(link['referred_from'][:5]) if link['referred_from'] else "N/A"
-        status = link['status_code'] if link['status_code'] else "Connection Error"
-        
-        html += f"""
-            <tr>
-                <td>{link['url']}</td>
-                <td class="{status_class}">{status}</td>
-                <td>{referring}</td>
-            </tr>
-        """
+        status_code = link['status_code']
+        referring = link['referred_from']
+        parts.append(REPORT_ROW.format(
+            url=escape(link['url']),
+            status_class="status-error" if status_code is not None and status_code >= 400 else "status-warning",
+            status=status_code if status_code else "Connection Error",
+            referring="<br>".join(map(escape, referring[:5])) if referring else "N/A"
+        ))
     
-    html += """
-        </table>
-    </body>
-    </html>
-    """
+    parts[0] = REPORT_HEADER.format(
+        start_url=escape(start_url),
+        scan_date=escape(scan_date),
+        count=len(parts) - 1
+    )
+    parts.append(REPORT_FOOTER)
     
-    return html
+    return "".join(parts)
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+def get_s3_client():
+    """Return a shared S3 client, created on first use and reused by warm Lambda containers"""
+    global _s3_client
+    if _s3_client is None:
+        # boto3's default session is not thread-safe for client creation
+        with _s3_client_lock:
+            if _s3_client is None:
+                _s3_client = boto3.client('s3', config=Config(tcp_keepalive=True, max_pool_connections=10))
+    return _s3_client
 
 def save_to_s3(content, bucket_name, key, content_type='text/html'):
     """Save content to S3 bucket"""
-    s3 = boto3.client('s3')
+    s3 = get_s3_client()
     s3.put_object(
         Body=content,
         Bucket=bucket_name,
@@ -250,8 +590,12 @@ def lambda_handler(event, context):
         report_key = f"reports/{date_prefix}/broken_links_report.html"
         json_key = f"reports/{date_prefix}/broken_links_data.json"
         
-        s3_html_path = save_to_s3(html_report, s3_bucket, report_key)
-        s3_json_path = save_to_s3(json.dumps(broken_links), s3_bucket, json_key, 'application/json')
+        # Upload both objects concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            html_upload = executor.submit(save_to_s3, html_report, s3_bucket, report_key)
+            json_upload = executor.submit(save_to_s3, orjson.dumps(broken_links), s3_bucket, json_key, 'application/json')
+            s3_html_path = html_upload.result()
+            s3_json_path = json_upload.result()
         
         return {
             'statusCode': 200,